@@ -1,46 +1,112 @@
+import json
+import os
+import tempfile
+import numpy as np
 import requests
 import pandas as pd
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Shared session so repeated loads reuse pooled keep-alive connections
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    max_retries=Retry(total=3, backoff_factor=0.3)
+))
+
+CACHE_DIR = os.path.expanduser("~/.cache/kalshi_weather")
+
+LATITUDE = 40.78
+LONGITUDE = -73.96
+
+def _cache_path(start_date, end_date, lat, lon):
+    """Path of the on-disk copy of a daily-highs download."""
+    return os.path.join(
+        CACHE_DIR, f"nyc_highs_{start_date}_{end_date}_{lat}_{lon}.pkl"
+    )
+
+def _read_cache(cache_path):
+    """Cached download, or None if it is missing or unreadable."""
+    if not os.path.exists(cache_path):
+        return None
+    try:
+        return pd.read_pickle(cache_path)
+    except Exception as e:
+        # e.g. a truncated file; download again and overwrite it
+        print(f"Ignoring unreadable cache {cache_path}: {e}")
+        return None
+
+def _write_cache(df, cache_path):
+    """
+    Write a download to the cache. The pickle goes to a temp file that is
+    renamed into place, so readers never see a partial file; failing to
+    write is not fatal.
+    """
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                df.to_pickle(f)
+            os.replace(tmp_path, cache_path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+    except OSError as e:
+        print(f"Could not write cache {cache_path}: {e}")
 
 def load_nyc_daily_highs(
     start_date="1995-01-01",
-    end_date="2024-12-31"
+    end_date="2024-12-31",
+    use_cache=True
 ):
     """
     Loads historical daily high temperatures for NYC (Central Park)
     using Open-Meteo Archive API.
+
+    Downloads are cached under CACHE_DIR, so later calls for the same
+    date range read from local disk instead of the network. Pass
+    use_cache=False to force a fresh download.
     """
+    cache_path = _cache_path(start_date, end_date, LATITUDE, LONGITUDE)
+    if use_cache:
+        cached = _read_cache(cache_path)
+        if cached is not None:
+            return cached
 
     url = "https://archive-api.open-meteo.com/v1/archive"
 
     params = {
-        "latitude": 40.78,
-        "longitude": -73.96,
+        "latitude": LATITUDE,
+        "longitude": LONGITUDE,
         "start_date": start_date,
         "end_date": end_date,
-        "hourly": "temperature_2m",
+        "daily": "temperature_2m_max",
         "timezone": "America/New_York"
     }
 
-    response = requests.get(url, params=params)
+    response = _SESSION.get(url, params=params, timeout=30)
     response.raise_for_status()
-    data = response.json()
-
-    df = pd.DataFrame({
-        "time": pd.to_datetime(data["hourly"]["time"]),
-        "temperature": data["hourly"]["temperature_2m"]
-    })
+    # Parse the raw bytes directly; skips requests' charset sniffing and text decode
+    data = json.loads(response.content)
 
     # Convert from Celsius to Fahrenheit
     # Open-Meteo API returns temperatures in Celsius by default
-    df["temperature"] = (df["temperature"] * 9/5) + 32
+    # (missing days come back as null and become NaN here)
+    highs = np.asarray(data["daily"]["temperature_2m_max"], dtype=np.float64)
+    # Store as contiguous float32: half the bytes for everything downstream
+    highs = np.ascontiguousarray(highs * 9/5 + 32, dtype=np.float32)
 
-    df["date"] = df["time"].dt.date
-
-    daily_highs = (
-        df.groupby("date")["temperature"]
-        .max()
-        .reset_index(name="high_temp")
-    )
+    # Open-Meteo aggregates the hourly series to daily maxima server-side
+    daily_highs = pd.DataFrame({
+        # numpy parses the ISO "YYYY-MM-DD" strings in C, unlike pd.to_datetime
+        "date": np.array(data["daily"]["time"], dtype="datetime64[D]"),
+        "high_temp": highs
+    })
 
-    daily_highs["date"] = pd.to_datetime(daily_highs["date"])
+    _write_cache(daily_highs, cache_path)
     return daily_highs
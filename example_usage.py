@@ -4,6 +4,7 @@ Example usage of the Kalshi Weather Forecasting System
 This script demonstrates how to use the system to find mispricing opportunities.
 """
 from datetime import date
+import pandas as pd
 from forecast_system import ForecastSystem
 
 
@@ -61,7 +62,7 @@ def main():
             print(f"   Date: {row['date']} | Temp: {row['temperature']}°F")
             print(f"   Model Prob: {row['model_probability']:.1%} | Market Price: {row['market_price']:.1%}")
             print(f"   Edge: {row['edge']:.1%} | EV: {row['expected_value']:.3f}")
-            if row['kelly_fraction']:
+            if pd.notna(row['kelly_fraction']):
                 print(f"   Kelly Fraction: {row['kelly_fraction']:.1%}")
             print(f"   Volume: {row['volume']}")
     else:
@@ -3,6 +3,7 @@ Main Forecasting System
 
 Orchestrates the complete probabilistic temperature forecasting system for Kalshi markets.
 """
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime
 from typing import Dict
 import pandas as pd
@@ -11,6 +12,9 @@ from nyc_temperature_model import NYCTemperatureModel
 from kalshi_markets import fetch_nyc_markets, KalshiMarketClient, MarketContractParser
 from mispricing_analyzer import MispricingAnalyzer
 
+# Worker threads for network I/O that can overlap with model setup
+_EXECUTOR = ThreadPoolExecutor(max_workers=2)
+
 
 class ForecastSystem:
     """
@@ -24,6 +28,9 @@ class ForecastSystem:
         """
         Initialize the forecasting system.
         
+        The historical data download starts in the background right away;
+        initialize() waits for it before training.
+        
         Args:
             historical_start: Start date for historical data
             historical_end: End date for historical data
@@ -34,23 +41,42 @@ class ForecastSystem:
         self.model_window = model_window
         self.model = None
         self.analyzer = None
+        self.client = KalshiMarketClient()
+        self._forecast_cache = {}
         self._initialized = False
+        self._data_future = _EXECUTOR.submit(
+            load_nyc_daily_highs,
+            start_date=self.historical_start,
+            end_date=self.historical_end
+        )
     
     def initialize(self, force_reload: bool = False):
         """
         Load data, train model, and initialize analyzer.
         
         Args:
-            force_reload: If True, reload data even if model already exists
+            force_reload: If True, re-download data (bypassing the disk cache)
+                and retrain even if a model already exists
         """
         if self._initialized and not force_reload:
             return
         
         print("Loading historical temperature data...")
-        df = load_nyc_daily_highs(
-            start_date=self.historical_start,
-            end_date=self.historical_end
-        )
+        # Take the background download before waiting on it, so a failed one
+        # is retried below instead of re-raised on every later call
+        future, self._data_future = self._data_future, None
+        df = None
+        if future is not None and not force_reload:
+            try:
+                df = future.result()
+            except Exception as e:
+                print(f"Background data load failed ({e}), retrying...")
+        if df is None:
+            df = load_nyc_daily_highs(
+                start_date=self.historical_start,
+                end_date=self.historical_end,
+                use_cache=not force_reload
+            )
         print(f"Loaded {len(df)} days of historical data")
         
         print("Training temperature model...")
@@ -58,6 +84,7 @@ class ForecastSystem:
         print("Model trained successfully")
         
         self.analyzer = MispricingAnalyzer(self.model)
+        self._forecast_cache.clear()
         self._initialized = True
     
     def get_forecast(self, target_date):
@@ -73,14 +100,21 @@ class ForecastSystem:
         if not self._initialized:
             self.initialize()
         
-        mu, sigma = self.model.get_forecast(target_date)
-        percentiles = self.model.get_percentiles(target_date)
+        # Forecasts only depend on the trained model, which is fixed until
+        # the next initialize(). The cache holds the raw parameters and a
+        # fresh dict is built per call, so callers can't mutate cached state.
+        cached = self._forecast_cache.get(target_date)
+        if cached is None:
+            mu, sigma = self.model.get_forecast(target_date)
+            percentiles = self.model.get_percentiles(target_date)
+            cached = self._forecast_cache[target_date] = (mu, sigma, percentiles)
+        mu, sigma, percentiles = cached
         
         return {
             "date": target_date,
             "mean": mu,
             "std": sigma,
-            "percentiles": percentiles,
+            "percentiles": dict(percentiles),
             "forecast_range_95": (percentiles[5], percentiles[95]),
             "forecast_range_80": (percentiles[10], percentiles[90]),
         }
@@ -102,11 +136,16 @@ class ForecastSystem:
         Returns:
             DataFrame with opportunities sorted by expected value
         """
+        # Start the market fetch first so it overlaps with any model training
+        print(f"Fetching {market_status} Kalshi markets...")
+        markets_future = _EXECUTOR.submit(
+            fetch_nyc_markets, status=market_status, client=self.client
+        )
+        
         if not self._initialized:
             self.initialize()
         
-        print(f"Fetching {market_status} Kalshi markets...")
-        contracts = fetch_nyc_markets(status=market_status)
+        contracts = markets_future.result()
         print(f"Found {len(contracts)} contracts")
         
         if not contracts:
@@ -114,18 +153,16 @@ class ForecastSystem:
             return pd.DataFrame()
         
         print("Analyzing contracts for mispricing opportunities...")
-        opportunities = self.analyzer.get_opportunities(
+        df = self.analyzer.analyze_contracts(
             contracts,
             min_edge=min_edge,
             min_volume=min_volume,
             max_results=max_results
         )
         
-        if not opportunities:
+        if df.empty:
             print("No opportunities found matching criteria")
-            return pd.DataFrame()
         
-        df = pd.DataFrame(opportunities)
         return df
     
     def analyze_specific_contract(self, market_ticker: str) -> Dict:
@@ -141,8 +178,7 @@ class ForecastSystem:
         if not self._initialized:
             self.initialize()
         
-        client = KalshiMarketClient()
-        market = client.get_market_details(market_ticker)
+        market = self.client.get_market_details(market_ticker)
         
         if not market:
             return {"error": f"Market {market_ticker} not found"}
@@ -187,17 +223,18 @@ class ForecastSystem:
             "-" * 80,
         ]
         
-        for idx, row in df.iterrows():
+        # itertuples yields plain namedtuples instead of boxing each row as a Series
+        for row in df.itertuples():
             report_lines.extend([
-                f"\n{idx + 1}. {row['ticker']}",
-                f"   Title: {row['title']}",
-                f"   Date: {row['date']} | Temperature: {row['temperature']}°F",
-                f"   Model Probability: {row['model_probability']:.1%}",
-                f"   Market Price: {row['market_price']:.1%}",
-                f"   Edge: {row['edge']:.1%}",
-                f"   Expected Value: {row['expected_value']:.3f}",
-                f"   Kelly Fraction: {row['kelly_fraction']:.1%}" if row['kelly_fraction'] else "   Kelly Fraction: N/A",
-                f"   Volume: {row['volume']}",
+                f"\n{row.Index + 1}. {row.ticker}",
+                f"   Title: {row.title}",
+                f"   Date: {row.date} | Temperature: {row.temperature}°F",
+                f"   Model Probability: {row.model_probability:.1%}",
+                f"   Market Price: {row.market_price:.1%}",
+                f"   Edge: {row.edge:.1%}",
+                f"   Expected Value: {row.expected_value:.3f}",
+                f"   Kelly Fraction: {row.kelly_fraction:.1%}" if pd.notna(row.kelly_fraction) else "   Kelly Fraction: N/A",
+                f"   Volume: {row.volume}",
             ])
         
         report_lines.append("\n" + "=" * 80)
@@ -1,4 +1,14 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Shared session so the markets and event lookups reuse one connection
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    max_retries=Retry(total=3, backoff_factor=0.3)
+))
 
 markets_url = "https://api.elections.kalshi.com/trade-api/v2/markets"
 params = {
@@ -6,7 +16,7 @@ params = {
     "status": "open"
 }
 
-markets_response = requests.get(markets_url, params=params)
+markets_response = _SESSION.get(markets_url, params=params)
 markets_data = markets_response.json()
 
 print("\nActive markets in KXHIGHNY series:")
@@ -21,7 +31,7 @@ if markets_data["markets"]:
     event_ticker = first_market["event_ticker"]
 
     event_url = f"https://api.elections.kalshi.com/trade-api/v2/events/{event_ticker}"
-    event_response = requests.get(event_url)
+    event_response = _SESSION.get(event_url)
     event_data = event_response.json()
 
     print("Event Details:")
@@ -1,13 +1,26 @@
+from concurrent.futures import ThreadPoolExecutor
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Shared session so every weather lookup reuses pooled connections
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    max_retries=Retry(total=3, backoff_factor=0.3)
+))
 
 station_id = "KNYC"  # Central Park, NYC
 url = f"https://api.weather.gov/stations/{station_id}/observations/latest"
 url2 = "https://api.open-meteo.com/v1/forecast?latitude=40.78&longitude=-73.96&hourly=temperature_2m,precipitation"
 
-response2 = requests.get(url2)
-data2 = response2.json()
-response = requests.get(url)
-data = response.json()
+# Fire both requests at once; wall time is the slower of the two, not the sum
+with ThreadPoolExecutor(max_workers=2) as executor:
+    future2 = executor.submit(_SESSION.get, url2)
+    future = executor.submit(_SESSION.get, url)
+    data2 = future2.result().json()
+    data = future.result().json()
 
 temp_c = data['properties']['temperature']['value']
 precip_mm = data['properties']['precipitationLastHour']['value']
@@ -23,7 +36,7 @@ def get_current_weather(lat, lon):
         "current_weather": "true"
     }
 
-    response = requests.get(url, params=params)
+    response = _SESSION.get(url, params=params)
     data = response.json()
 
     if "current_weather" not in data:
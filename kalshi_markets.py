@@ -4,10 +4,51 @@ Kalshi Market Integration Module
 Fetches and parses Kalshi weather market contracts for NYC temperature markets.
 """
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime, date
+from functools import lru_cache
 import re
 from typing import List, Dict, Optional, Tuple
 
+# Temperature patterns: "50°F" or "50 F", ">= 50" or "< 50", "50 degrees"
+_TEMP_PATTERNS = [
+    re.compile(p, re.IGNORECASE) for p in (
+        r'([\d.]+)\s*°?\s*F',
+        r'[><=]+\s*([\d.]+)',
+        r'([\d.]+)\s*degrees',
+    )
+]
+
+# Date patterns: "Dec 25", "December 25, 2025", "12/25", "12/25/2025"
+_DATE_PATTERNS = [
+    re.compile(p, re.IGNORECASE) for p in (
+        r'(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+(\d{1,2})(?:,\s*(\d{4}))?',
+        r'(\d{1,2})/(\d{1,2})(?:/(\d{2,4}))?',
+    )
+]
+
+_MONTH_MAP = {
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+    'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12
+}
+
+_GREATER_KEYWORDS = ('>=', 'greater', 'above', 'over', 'exceed')
+_LESS_KEYWORDS = ('<=', 'less', 'below', 'under')
+_RANGE_KEYWORDS = ('between', 'range', 'within')
+
+# One alternation over every contract-type keyword; the lookahead reports
+# overlapping matches so no keyword can hide another
+_CONTRACT_TYPES = (
+    ("greater_than", _GREATER_KEYWORDS),
+    ("less_than", _LESS_KEYWORDS),
+    ("range", _RANGE_KEYWORDS),
+)
+_TYPE_MAP = {kw: ctype for ctype, keywords in _CONTRACT_TYPES for kw in keywords}
+_TYPE_RE = re.compile(
+    "(?=(" + "|".join(re.escape(kw) for kw in _TYPE_MAP) + "))", re.IGNORECASE
+)
+
 
 class KalshiMarketClient:
     """Client for interacting with Kalshi API to fetch weather market data."""
@@ -16,6 +57,14 @@ class KalshiMarketClient:
     
     def __init__(self):
         self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=20,
+            max_retries=Retry(total=3, backoff_factor=0.3)
+        ))
+        self.session.headers.update({"Accept-Encoding": "gzip"})
+        # (url, series_ticker, status) -> (ETag, markets) from the last full response
+        self._etag_cache: Dict[Tuple, Tuple[str, List[Dict]]] = {}
     
     def get_markets(self, series_ticker: str = "KXHIGHNY", status: str = "open") -> List[Dict]:
         """
@@ -27,18 +76,31 @@ class KalshiMarketClient:
             
         Returns:
             List of market dictionaries
+            
+        Repeated polls send the last ETag as If-None-Match; on 304 Not Modified
+        the previously returned markets are reused without re-downloading.
+        Callers always get their own copies, so mutating them is safe.
         """
         url = f"{self.BASE_URL}/markets"
         params = {
             "series_ticker": series_ticker,
             "status": status
         }
+        cache_key = (url, series_ticker, status)
+        cached = self._etag_cache.get(cache_key)
+        headers = {"If-None-Match": cached[0]} if cached else None
         
         try:
-            response = self.session.get(url, params=params, timeout=10)
+            response = self.session.get(url, params=params, headers=headers, timeout=10)
+            if response.status_code == 304 and cached:
+                return [dict(m) for m in cached[1]]
             response.raise_for_status()
             data = response.json()
-            return data.get("markets", [])
+            markets = data.get("markets", [])
+            etag = response.headers.get("ETag")
+            if etag:
+                self._etag_cache[cache_key] = (etag, [dict(m) for m in markets])
+            return markets
         except requests.RequestException as e:
             print(f"Error fetching markets: {e}")
             return []
@@ -82,15 +144,8 @@ class MarketContractParser:
         Returns:
             Temperature in Fahrenheit, or None if not found
         """
-        # Look for temperature patterns: "50°F", "50 F", ">= 50", etc.
-        patterns = [
-            r'([\d.]+)\s*°?\s*F',  # "50°F" or "50 F"
-            r'[><=]+\s*([\d.]+)',  # ">= 50" or "< 50"
-            r'([\d.]+)\s*degrees',  # "50 degrees"
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, title, re.IGNORECASE)
+        for pattern in _TEMP_PATTERNS:
+            match = pattern.search(title)
             if match:
                 try:
                     return float(match.group(1))
@@ -100,27 +155,23 @@ class MarketContractParser:
         return None
     
     @staticmethod
-    def parse_date_from_title(title: str) -> Optional[date]:
+    def parse_date_from_title(title: str, default_year: Optional[int] = None) -> Optional[date]:
         """
         Extract date from market title.
         Handles patterns like "Dec 25", "December 25, 2025", etc.
         
+        Args:
+            title: Market title
+            default_year: Year to use when the title omits one (defaults to the current year)
+            
         Returns:
             date object or None
         """
-        # Common date patterns
-        patterns = [
-            r'(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+(\d{1,2})(?:,\s*(\d{4}))?',
-            r'(\d{1,2})/(\d{1,2})(?:/(\d{2,4}))?',
-        ]
-        
-        month_map = {
-            'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
-            'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12
-        }
+        if default_year is None:
+            default_year = datetime.now().year
         
-        for pattern in patterns:
-            match = re.search(pattern, title, re.IGNORECASE)
+        for pattern in _DATE_PATTERNS:
+            match = pattern.search(title)
             if match:
                 try:
                     if '/' in match.group(0):
@@ -128,16 +179,16 @@ class MarketContractParser:
                         parts = match.group(0).split('/')
                         month = int(parts[0])
                         day = int(parts[1])
-                        year = int(parts[2]) if len(parts) > 2 and parts[2] else datetime.now().year
+                        year = int(parts[2]) if len(parts) > 2 and parts[2] else default_year
                         if year < 100:
                             year += 2000
                         return date(year, month, day)
                     else:
                         # Month name format
                         month_name = match.group(1).lower()[:3]
-                        month = month_map.get(month_name)
+                        month = _MONTH_MAP.get(month_name)
                         day = int(match.group(2))
-                        year = int(match.group(3)) if match.group(3) else datetime.now().year
+                        year = int(match.group(3)) if match.group(3) else default_year
                         return date(year, month, day)
                 except (ValueError, IndexError):
                     continue
@@ -152,27 +203,32 @@ class MarketContractParser:
         Returns:
             "greater_than", "less_than", "range", or "unknown"
         """
-        title_lower = title.lower()
-        
-        if any(op in title_lower for op in ['>=', 'greater', 'above', 'over', 'exceed']):
-            return "greater_than"
-        elif any(op in title_lower for op in ['<=', 'less', 'below', 'under']):
-            return "less_than"
-        elif any(word in title_lower for word in ['between', 'range', 'within']):
-            return "range"
-        else:
-            return "unknown"
+        found = {_TYPE_MAP[kw.lower()] for kw in _TYPE_RE.findall(title)}
+        
+        # Keyword groups take priority in order: greater, less, range
+        for contract_type, _ in _CONTRACT_TYPES:
+            if contract_type in found:
+                return contract_type
+        return "unknown"
     
     @staticmethod
-    def parse_contract(market: Dict) -> Dict:
+    def parse_contract(market: Dict, default_year: Optional[int] = None) -> Dict:
         """
         Parse a market contract to extract structured information.
         
+        Args:
+            market: Raw market dictionary from the Kalshi API
+            default_year: Year for titles without one; pass it in when parsing
+                a batch so the current year is looked up only once
+        
         Returns:
             Dictionary with parsed contract details
         """
         title = market.get("title", "")
         ticker = market.get("ticker", "")
+        if default_year is None:
+            default_year = datetime.now().year
+        temperature, contract_date, contract_type = _parse_title(title, default_year)
         
         contract = {
             "ticker": ticker,
@@ -186,9 +242,9 @@ class MarketContractParser:
             "open_time": market.get("open_time"),
             "close_time": market.get("close_time"),
             "status": market.get("status", "unknown"),
-            "temperature": MarketContractParser.parse_temperature_threshold(title),
-            "date": MarketContractParser.parse_date_from_title(title),
-            "contract_type": MarketContractParser.parse_contract_type(title),
+            "temperature": temperature,
+            "date": contract_date,
+            "contract_type": contract_type,
         }
         
         # Calculate mid price (average of bid and ask)
@@ -204,21 +260,35 @@ class MarketContractParser:
         return contract
 
 
-def fetch_nyc_markets(status: str = "open") -> List[Dict]:
+@lru_cache(maxsize=4096)
+def _parse_title(title: str, default_year: int) -> Tuple[Optional[float], Optional[date], str]:
+    """Memoized title parse; repeated market polls see the same titles."""
+    return (
+        MarketContractParser.parse_temperature_threshold(title),
+        MarketContractParser.parse_date_from_title(title, default_year),
+        MarketContractParser.parse_contract_type(title),
+    )
+
+
+def fetch_nyc_markets(status: str = "open",
+                      client: Optional[KalshiMarketClient] = None) -> List[Dict]:
     """
     Convenience function to fetch and parse NYC temperature markets.
     
     Args:
         status: Market status filter
+        client: Existing client to reuse (keeps its pooled connections warm)
         
     Returns:
         List of parsed contract dictionaries
     """
-    client = KalshiMarketClient()
+    if client is None:
+        client = KalshiMarketClient()
     markets = client.get_markets(series_ticker="KXHIGHNY", status=status)
     
     parser = MarketContractParser()
-    contracts = [parser.parse_contract(m) for m in markets]
+    current_year = datetime.now().year
+    contracts = [parser.parse_contract(m, current_year) for m in markets]
     
     return contracts
 
@@ -3,8 +3,10 @@ Mispricing Analysis Module
 
 Compares model probabilities with market prices to identify mispriced contracts.
 """
+import math
 from typing import List, Dict, Optional
-from datetime import date, datetime
+from datetime import date
+import numpy as np
 import pandas as pd
 from nyc_temperature_model import NYCTemperatureModel
 
@@ -23,6 +25,30 @@ class MispricingAnalyzer:
             model: Trained NYCTemperatureModel instance
         """
         self.model = model
+        # contract["date"] -> (mean, 1 / (std * sqrt(2))); many contracts share an expiry date
+        self._param_cache: Dict = {}
+    
+    @staticmethod
+    def _normalize_contracts(contracts: List[Dict]) -> np.ndarray:
+        """
+        Resolve each contract's date to its day of year, once per batch.
+        
+        String dates are parsed with date.fromisoformat, and each distinct
+        date is converted only once.
+        
+        Returns:
+            Integer array of days of year (1-366), aligned with contracts
+        """
+        doy_by_date = {}
+        doys = np.empty(len(contracts), dtype=np.intp)
+        for i, contract in enumerate(contracts):
+            key = contract["date"]
+            doy = doy_by_date.get(key)
+            if doy is None:
+                contract_date = date.fromisoformat(key) if isinstance(key, str) else key
+                doy = doy_by_date[key] = contract_date.timetuple().tm_yday
+            doys[i] = doy
+        return doys
     
     def calculate_model_probability(self, contract: Dict) -> Optional[float]:
         """
@@ -43,23 +69,24 @@ class MispricingAnalyzer:
         if temperature is None:
             return None
         
-        contract_date = contract["date"]
-        if isinstance(contract_date, str):
-            contract_date = datetime.strptime(contract_date, "%Y-%m-%d").date()
+        if contract_type not in ("greater_than", "less_than", "range"):
+            return None
         
         try:
-            if contract_type == "greater_than":
-                # Contract pays if temp >= threshold
-                return self.model.prob_greater_equal(temperature, contract_date)
-            elif contract_type == "less_than":
+            key = contract["date"]
+            params = self._param_cache.get(key)
+            if params is None:
+                params = self.model._erfc_params_for_date(key)
+                self._param_cache[key] = params
+            mu, inv_sigma_sqrt2 = params
+            
+            # Same erfc forms as NYCTemperatureModel.prob_less_equal / prob_greater_equal
+            if contract_type == "less_than":
                 # Contract pays if temp <= threshold
-                return self.model.prob_less_equal(temperature, contract_date)
-            elif contract_type == "range":
-                # For range contracts, would need to parse both bounds
-                # For now, treat as single threshold
-                return self.model.prob_greater_equal(temperature, contract_date)
-            else:
-                return None
+                return 0.5 * math.erfc((mu - temperature - 0.01) * inv_sigma_sqrt2)
+            # greater_than pays if temp >= threshold. For range contracts we
+            # would need to parse both bounds; for now, treat as single threshold
+            return 0.5 * math.erfc((temperature - 0.01 - mu) * inv_sigma_sqrt2)
         except Exception as e:
             print(f"Error calculating probability for {contract.get('ticker')}: {e}")
             return None
@@ -103,12 +130,12 @@ class MispricingAnalyzer:
             return None
         
         # Kelly fraction = (bp - q) / b
-        # where b = odds (1/price - 1), p = win prob, q = lose prob
-        odds = (1.0 / market_price) - 1.0
-        kelly = (odds * model_prob - (1 - model_prob)) / odds
+        # where b = odds (1/price - 1), p = win prob, q = lose prob.
+        # Substituting b = (1 - price) / price reduces this to:
+        kelly = (model_prob - market_price) / (1.0 - market_price)
         
         # Only return positive Kelly (favorable bets)
-        return max(0.0, kelly) if kelly > 0 else None
+        return kelly if kelly > 0 else None
     
     def analyze_contract(self, contract: Dict) -> Dict:
         """
@@ -117,23 +144,29 @@ class MispricingAnalyzer:
         Returns:
             Dictionary with analysis results
         """
+        market_price = contract.get("yes_mid")
         model_prob = self.calculate_model_probability(contract)
         
         if model_prob is None:
             return {
                 "contract": contract,
                 "model_probability": None,
-                "market_price": contract.get("yes_mid"),
+                "market_price": market_price,
                 "expected_value": None,
                 "kelly_fraction": None,
                 "edge": None,
                 "analysis_status": "cannot_evaluate"
             }
         
-        market_price = contract.get("yes_mid")
-        expected_value = self.calculate_expected_value(contract, model_prob) if market_price else None
-        kelly_fraction = self.calculate_kelly_fraction(contract, model_prob)
-        edge = model_prob - market_price if market_price else None
+        # Same maths as calculate_expected_value / calculate_kelly_fraction,
+        # fused so the contract is only read once
+        edge = expected_value = kelly_fraction = None
+        if market_price:
+            edge = model_prob - market_price
+            expected_value = edge
+            if 0 < market_price < 1 and 0 < model_prob < 1:
+                kelly = edge / (1.0 - market_price)
+                kelly_fraction = kelly if kelly > 0 else None
         
         return {
             "contract": contract,
@@ -147,39 +180,86 @@ class MispricingAnalyzer:
     
     def analyze_contracts(self, contracts: List[Dict], 
                          min_edge: float = 0.05,
-                         min_volume: int = 0) -> pd.DataFrame:
+                         min_volume: int = 0,
+                         max_results: Optional[int] = None) -> pd.DataFrame:
         """
         Analyze multiple contracts and return opportunities.
         
+        Contracts are handled as columns rather than per-row dicts: every
+        contract is priced by one NYCTemperatureModel.prob_yes_batch call.
+        Use analyze_contract for a single contract.
+        
         Args:
             contracts: List of parsed contract dictionaries
             min_edge: Minimum edge (model_prob - market_price) to include
             min_volume: Minimum trading volume to include
+            max_results: If given, keep only this many top contracts by expected value
             
         Returns:
             DataFrame with analysis results, sorted by expected value
         """
-        results = []
+        # Only contracts the model can price and the market has quoted can have an edge
+        candidates = [
+            c for c in contracts
+            if c.get("volume", 0) >= min_volume
+            and c.get("date") is not None
+            and c.get("temperature") is not None
+            and c.get("contract_type") in ("greater_than", "less_than", "range")
+            and c.get("yes_mid")
+        ]
+        if not candidates:
+            return pd.DataFrame()
         
-        for contract in contracts:
-            # Filter by volume if specified
-            if contract.get("volume", 0) < min_volume:
-                continue
-            
-            analysis = self.analyze_contract(contract)
-            
-            # Filter by edge if specified
-            if analysis["edge"] is not None and analysis["edge"] >= min_edge:
-                results.append(analysis)
+        temperatures = np.array([c["temperature"] for c in candidates], dtype=np.float64)
+        market_price = np.array([c["yes_mid"] for c in candidates], dtype=np.float64)
+        is_less = np.array([c["contract_type"] == "less_than" for c in candidates])
         
-        if not results:
+        # less_than pays if temp <= threshold; greater_than (and range, treated
+        # as a single threshold for now) pays if temp >= threshold
+        model_prob = self.model.prob_yes_batch(
+            temperatures, self._normalize_contracts(candidates), is_less
+        )
+        edge = model_prob - market_price
+        
+        # Kelly fraction (p - price) / (1 - price), see calculate_kelly_fraction
+        with np.errstate(divide="ignore", invalid="ignore"):
+            kelly = (model_prob - market_price) / (1.0 - market_price)
+        kelly_valid = (
+            (market_price > 0) & (market_price < 1) &
+            (model_prob > 0) & (model_prob < 1) & (kelly > 0)
+        )
+        kelly = np.where(kelly_valid, kelly, np.nan)
+        
+        keep = np.nonzero(edge >= min_edge)[0]
+        if keep.size == 0 or (max_results is not None and max_results <= 0):
             return pd.DataFrame()
         
-        df = pd.DataFrame(results)
+        # Order by expected value (descending). When only the top max_results
+        # are wanted, partition them out in O(N) and sort just those.
+        ev = edge[keep]
+        if max_results is not None and max_results < keep.size:
+            top = np.argpartition(-ev, max_results - 1)[:max_results]
+            keep = keep[top[np.argsort(-ev[top], kind="stable")]]
+        else:
+            keep = keep[np.argsort(-ev, kind="stable")]
         
-        # Sort by expected value (descending)
-        if "expected_value" in df.columns:
-            df = df.sort_values("expected_value", ascending=False, na_last=True)
+        # Slice every column with the same row indices before building the frame.
+        # Only the contract fields reports need are copied; probabilities are
+        # stored as float32 and the contract type as a categorical.
+        rows = [candidates[i] for i in keep]
+        df = pd.DataFrame({
+            "ticker": [c["ticker"] for c in rows],
+            "title": [c["title"] for c in rows],
+            "date": [c["date"] for c in rows],
+            "temperature": temperatures[keep],
+            "model_probability": model_prob[keep].astype(np.float32),
+            "market_price": market_price[keep].astype(np.float32),
+            "edge": edge[keep].astype(np.float32),
+            "expected_value": edge[keep].astype(np.float32),
+            "kelly_fraction": kelly[keep].astype(np.float32),
+            "volume": np.array([c.get("volume", 0) for c in rows]),
+            "contract_type": pd.Categorical([c["contract_type"] for c in rows]),
+        })
         
         return df
     
@@ -199,27 +279,7 @@ class MispricingAnalyzer:
         Returns:
             List of opportunity dictionaries
         """
-        df = self.analyze_contracts(contracts, min_edge=min_edge, min_volume=min_volume)
-        
-        if df.empty:
-            return []
-        
-        opportunities = []
-        for _, row in df.head(max_results).iterrows():
-            opp = {
-                "ticker": row["contract"]["ticker"],
-                "title": row["contract"]["title"],
-                "date": row["contract"]["date"],
-                "temperature": row["contract"]["temperature"],
-                "model_probability": row["model_probability"],
-                "market_price": row["market_price"],
-                "edge": row["edge"],
-                "expected_value": row["expected_value"],
-                "kelly_fraction": row["kelly_fraction"],
-                "volume": row["contract"]["volume"],
-                "contract_type": row["contract"]["contract_type"],
-            }
-            opportunities.append(opp)
-        
-        return opportunities
-
+        df = self.analyze_contracts(
+            contracts, min_edge=min_edge, min_volume=min_volume, max_results=max_results
+        )
+        return df.to_dict("records")
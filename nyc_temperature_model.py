@@ -1,7 +1,11 @@
-from scipy.stats import norm
+import math
+from scipy.special import erfc, ndtri
 import numpy as np
 from datetime import datetime, date
-import pandas as pd
+
+_SQRT2 = math.sqrt(2.0)
+
+DEFAULT_PERCENTILES = (5, 10, 25, 50, 75, 90, 95)
 
 
 class NYCTemperatureModel:
@@ -11,15 +15,68 @@ class NYCTemperatureModel:
     """
     
     def __init__(self, mu_by_doy, sigma_by_doy, min_samples=30):
-        self.mu_by_doy = mu_by_doy
-        self.sigma_by_doy = sigma_by_doy
+        """
+        Args:
+            mu_by_doy: Array of length 367 indexed by day of year (1-366),
+                NaN where there was too little data
+            sigma_by_doy: Standard deviations, laid out like mu_by_doy
+            min_samples: Minimum samples that were required per day of year
+        """
+        self.mu_by_doy = np.asarray(mu_by_doy, dtype=np.float64)
+        self.sigma_by_doy = np.asarray(sigma_by_doy, dtype=np.float64)
         self.min_samples = min_samples
+        self._nearest = self._nearest_valid_doy(~np.isnan(self.mu_by_doy))
+        # Parameters with the nearest-day fallback already applied, so batch
+        # queries need a single gather (NaN where the model has no data)
+        has_data = self._nearest >= 0
+        self._mu_resolved = np.where(has_data, self.mu_by_doy[self._nearest], np.nan)
+        # 1 / (sigma * sqrt(2)) per day of year, so probabilities are a single
+        # multiply into erfc: Phi(z) = 0.5 * erfc(-z / sqrt(2))
+        with np.errstate(divide="ignore"):
+            self._inv_sigma_sqrt2 = 1.0 / (self.sigma_by_doy * _SQRT2)
+        self._inv_sigma_sqrt2_resolved = np.where(
+            has_data, self._inv_sigma_sqrt2[self._nearest], np.nan
+        )
+        # Default percentiles per day of year, shape (367, len(DEFAULT_PERCENTILES))
+        z = ndtri(np.array(DEFAULT_PERCENTILES) / 100)
+        self._pct_table = self.mu_by_doy[:, None] + self.sigma_by_doy[:, None] * z[None, :]
+
+    @staticmethod
+    def _nearest_valid_doy(valid):
+        """
+        For each day of year, the closest day (searching outward, earlier
+        first) that has parameters; -1 when the model has no data at all.
+        """
+        nearest = np.full(367, -1, dtype=np.int32)
+        for doy in range(1, 367):
+            if valid[doy]:
+                nearest[doy] = doy
+                continue
+            for offset in range(1, 183):
+                found = False
+                for test_doy in [doy - offset, doy + offset]:
+                    if test_doy < 1:
+                        test_doy += 365
+                    elif test_doy > 365:
+                        test_doy -= 365
+                    if valid[test_doy]:
+                        nearest[doy] = test_doy
+                        found = True
+                        break
+                if found:
+                    break
+        return nearest
 
     @classmethod
     def train(cls, df, window=7, min_samples=30):
         """
         Train the model on historical temperature data.
         
+        Per-day-of-year counts, sums and sums of squares are accumulated once
+        with np.bincount, then summed over a circular window of +/- `window`
+        days (wrapping across the year boundary) with a 1D convolution.
+        Mean and sample standard deviation follow from those moments.
+        
         Args:
             df: DataFrame with columns 'date' (datetime) and 'high_temp' (float)
             window: Days around each day-of-year to include in statistics
@@ -28,62 +85,74 @@ class NYCTemperatureModel:
         Returns:
             Trained NYCTemperatureModel instance
         """
-        df = df.copy()
-        df["doy"] = df["date"].dt.dayofyear
-
-        mu_by_doy = {}
-        sigma_by_doy = {}
-
-        for doy in range(1, 367):
-            # Handle year boundaries
-            if doy - window < 1:
-                mask = (
-                    (df["doy"] >= 365 + doy - window) |
-                    (df["doy"] <= doy + window)
-                )
-            elif doy + window > 366:
-                mask = (
-                    (df["doy"] >= doy - window) |
-                    (df["doy"] <= doy + window - 365)
-                )
-            else:
-                mask = (
-                    (df["doy"] >= doy - window) &
-                    (df["doy"] <= doy + window)
-                )
-
-            temps = df.loc[mask, "high_temp"].dropna()
-
-            if len(temps) < min_samples:
-                continue
-
-            mu_by_doy[doy] = temps.mean()
-            sigma_by_doy[doy] = temps.std(ddof=1)
-
+        doy = df["date"].dt.dayofyear.to_numpy()
+        
+        # load_nyc_daily_highs already yields contiguous float32; copy only
+        # when handed anything else (e.g. a float64 frame from elsewhere)
+        temp = df["high_temp"].to_numpy()
+        if temp.dtype != np.float32 or not temp.flags.c_contiguous:
+            temp = np.ascontiguousarray(temp, dtype=np.float32)
+        
+        valid = ~np.isnan(temp)
+        doy, temp = doy[valid], temp[valid]
+        
+        s1 = np.bincount(doy, weights=temp, minlength=367)[1:367]
+        s2 = np.bincount(doy, weights=temp * temp, minlength=367)[1:367]
+        n = np.bincount(doy, minlength=367)[1:367]
+        
+        kernel = np.ones(2 * window + 1)
+        
+        def windowed_sum(a):
+            wrapped = np.concatenate([a[len(a) - window:], a, a[:window]])
+            return np.convolve(wrapped, kernel, mode="valid")
+        
+        S1, S2, N = windowed_sum(s1), windowed_sum(s2), windowed_sum(n)
+        
+        # The sample standard deviation needs at least two points
+        enough = N >= max(min_samples, 2)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mu = S1 / N
+            var = (S2 - S1 * S1 / N) / (N - 1)
+        
+        mu_by_doy = np.full(367, np.nan)
+        sigma_by_doy = np.full(367, np.nan)
+        mu_by_doy[1:][enough] = mu[enough]
+        sigma_by_doy[1:][enough] = np.sqrt(np.maximum(var[enough], 0.0))
+        
         return cls(mu_by_doy, sigma_by_doy, min_samples)
 
-    def _params_for_date(self, date_obj):
-        """Get mean and standard deviation for a given date."""
+    @staticmethod
+    def _to_date(date_obj):
+        """Normalize a date, datetime, or YYYY-MM-DD string to a date."""
         if isinstance(date_obj, str):
-            date_obj = datetime.strptime(date_obj, "%Y-%m-%d").date()
+            return date.fromisoformat(date_obj)
         elif isinstance(date_obj, datetime):
-            date_obj = date_obj.date()
-            
-        doy = date_obj.timetuple().tm_yday
+            return date_obj.date()
+        return date_obj
+
+    def _params_for_date(self, date_obj):
+        """Get mean and standard deviation for a given date."""
+        date_obj = self._to_date(date_obj)
+        try:
+            return self._params_for_doy(date_obj.timetuple().tm_yday)
+        except ValueError:
+            raise ValueError(f"No data available for date {date_obj}") from None
+
+    def _params_for_doy(self, doy):
+        """Get mean and standard deviation for a day of year (1-366)."""
+        doy = self._nearest[doy]
+        if doy < 0:
+            raise ValueError("No data available in model")
         
-        if doy not in self.mu_by_doy:
-            # Find nearest available day
-            for offset in range(1, 183):
-                for test_doy in [doy - offset, doy + offset]:
-                    if test_doy < 1:
-                        test_doy += 365
-                    elif test_doy > 365:
-                        test_doy -= 365
-                    if test_doy in self.mu_by_doy:
-                        return self.mu_by_doy[test_doy], self.sigma_by_doy[test_doy]
+        return float(self.mu_by_doy[doy]), float(self.sigma_by_doy[doy])
+
+    def _erfc_params_for_date(self, date_obj):
+        """Get mean and 1 / (std * sqrt(2)) for a given date."""
+        date_obj = self._to_date(date_obj)
+        doy = self._nearest[date_obj.timetuple().tm_yday]
+        if doy < 0:
             raise ValueError(f"No data available for date {date_obj}")
-        
-        return self.mu_by_doy[doy], self.sigma_by_doy[doy]
+        return float(self.mu_by_doy[doy]), float(self._inv_sigma_sqrt2[doy])
 
     def get_forecast(self, date_obj):
         """
@@ -94,15 +163,44 @@ class NYCTemperatureModel:
         """
         return self._params_for_date(date_obj)
 
-    def get_percentiles(self, date_obj, percentiles=[5, 10, 25, 50, 75, 90, 95]):
+    def prob_yes_batch(self, temperatures, doys, is_less):
+        """
+        Vectorized probability for a batch of threshold contracts.
+        
+        Args:
+            temperatures: Array of thresholds (Fahrenheit)
+            doys: Array of days of year (1-366)
+            is_less: Boolean array; True where the contract pays if temp <= threshold,
+                False where it pays if temp >= threshold
+            
+        Returns:
+            numpy array of probabilities (NaN where the model has no data)
+        """
+        doys = np.asarray(doys, dtype=np.intp)
+        mu = self._mu_resolved[doys]
+        inv_sigma_sqrt2 = self._inv_sigma_sqrt2_resolved[doys]
+        # P(T <= x) = Phi((x + 0.01 - mu) / sigma), P(T >= x) = Phi((mu - x + 0.01) / sigma)
+        z = np.where(is_less, temperatures - mu, mu - temperatures) + 0.01
+        return 0.5 * erfc(-z * inv_sigma_sqrt2)
+
+    def get_percentiles(self, date_obj, percentiles=DEFAULT_PERCENTILES):
         """
         Get temperature percentiles for a date.
         
+        The default percentiles are read from a table precomputed per day of
+        year; other percentile lists are computed on demand.
+        
         Returns:
             dict: Mapping of percentile to temperature value
         """
+        date_obj = self._to_date(date_obj)
+        if tuple(percentiles) == DEFAULT_PERCENTILES:
+            doy = self._nearest[date_obj.timetuple().tm_yday]
+            if doy >= 0:
+                return dict(zip(DEFAULT_PERCENTILES, self._pct_table[doy].tolist()))
+        
         mu, sigma = self._params_for_date(date_obj)
-        return {p: float(norm.ppf(p / 100, mu, sigma)) for p in percentiles}
+        return {p: float(mu + sigma * ndtri(p / 100)) for p in percentiles}
 
     # -------- Probability API --------
 
@@ -117,8 +215,9 @@ class NYCTemperatureModel:
         Returns:
             float: Probability in [0, 1]
         """
-        mu, sigma = self._params_for_date(date_obj)
-        return float(1 - norm.cdf(x, mu, sigma))
+        mu, inv_sigma_sqrt2 = self._erfc_params_for_date(date_obj)
+        # P(T > x) = 0.5 * erfc((x - mu) / (sigma * sqrt(2))); no 1 - Phi cancellation
+        return 0.5 * math.erfc((x - mu) * inv_sigma_sqrt2)
 
     def prob_less_than(self, x, date_obj):
         """
@@ -131,16 +230,18 @@ class NYCTemperatureModel:
         Returns:
             float: Probability in [0, 1]
         """
-        mu, sigma = self._params_for_date(date_obj)
-        return float(norm.cdf(x, mu, sigma))
+        mu, inv_sigma_sqrt2 = self._erfc_params_for_date(date_obj)
+        return 0.5 * math.erfc((mu - x) * inv_sigma_sqrt2)
 
     def prob_greater_equal(self, x, date_obj):
         """Probability that temperature will be >= x."""
-        return self.prob_greater_than(x - 0.01, date_obj)
+        mu, inv_sigma_sqrt2 = self._erfc_params_for_date(date_obj)
+        return 0.5 * math.erfc((x - 0.01 - mu) * inv_sigma_sqrt2)
 
     def prob_less_equal(self, x, date_obj):
         """Probability that temperature will be <= x."""
-        return self.prob_less_than(x + 0.01, date_obj)
+        mu, inv_sigma_sqrt2 = self._erfc_params_for_date(date_obj)
+        return 0.5 * math.erfc((mu - x - 0.01) * inv_sigma_sqrt2)
 
     def prob_range(self, low, high, date_obj, inclusive_low=True, inclusive_high=False):
         """
@@ -156,14 +257,15 @@ class NYCTemperatureModel:
         Returns:
             float: Probability in [0, 1]
         """
-        mu, sigma = self._params_for_date(date_obj)
+        mu, inv_sigma_sqrt2 = self._erfc_params_for_date(date_obj)
         
         if not inclusive_low:
             low = low + 0.01
         if inclusive_high:
             high = high + 0.01
             
-        return float(norm.cdf(high, mu, sigma) - norm.cdf(low, mu, sigma))
+        return 0.5 * (math.erfc((low - mu) * inv_sigma_sqrt2)
+                      - math.erfc((high - mu) * inv_sigma_sqrt2))
 
     def prob_exactly(self, x, date_obj, tolerance=0.5):
         """